@@ -1,30 +1,62 @@
 import asyncio
+import threading
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext as PlaywrightContext
+from playwright._impl._errors import TargetClosedError
 from agentql import wrap_async
 import logging
-import traceback
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Maximum number of idle pages kept open for reuse
+PAGE_POOL_SIZE = 4
+
+# Maximum number of pages in use at the same time
+MAX_CONCURRENT_PAGES = 4
+
+# Resource types that are never needed to extract text content
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+async def _block_heavy_resources(route):
+    """Abort requests for resources that only matter for rendering"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class BrowserContext:
     _instance = None
     _browser: Browser = None
     _context: PlaywrightContext = None
-    _lock = asyncio.Lock()
+    _lock: Optional[asyncio.Lock] = None
+    _lock_init = threading.Lock()
+    
+    def __init__(self):
+        self._page_pool: asyncio.Queue = asyncio.Queue(maxsize=PAGE_POOL_SIZE)
+        self._page_sem = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        self._closing = False
     
     @classmethod
     async def get_instance(cls) -> 'BrowserContext':
         """Get singleton instance of BrowserContext"""
-        if not cls._instance:
-            async with cls._lock:
-                if not cls._instance:
-                    logger.info("Creating new BrowserContext instance")
-                    cls._instance = cls()
-                    await cls._instance._initialize()
+        # Fast path once the browser is up: no lock needed
+        if cls._instance is not None:
+            return cls._instance
+        
+        # Create the asyncio lock lazily so it is not bound to the import-time loop
+        if cls._lock is None:
+            with cls._lock_init:
+                if cls._lock is None:
+                    cls._lock = asyncio.Lock()
+        
+        async with cls._lock:
+            if cls._instance is None:
+                logger.info("Creating new BrowserContext instance")
+                instance = cls()
+                await instance._initialize()
+                # Only publish the instance once it is fully initialized
+                cls._instance = instance
         return cls._instance
     
     async def _initialize(self):
@@ -42,81 +74,144 @@ class BrowserContext:
                     viewport={'width': 1920, 'height': 1080},
                     user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
                 )
+                logger.info("Blocking images, media, fonts and stylesheets")
+                await self._context.route("**/*", _block_heavy_resources)
+                # Drop the singleton if Chromium crashes so the next caller relaunches it
+                self._browser.on("disconnected", self._on_disconnected)
                 logger.info("Browser initialization complete")
             except Exception as e:
-                logger.error(f"Error during browser initialization: {str(e)}")
-                logger.error(f"Stack trace: {traceback.format_exc()}")
+                logger.exception(f"Error during browser initialization: {str(e)}")
                 raise
     
+    def _on_disconnected(self, browser: Browser):
+        """Forget this instance when its browser goes away without close() being called"""
+        cls = type(self)
+        if self._closing:
+            return
+        logger.warning("Browser disconnected, it will be relaunched on next use")
+        if cls._instance is self:
+            cls._instance = None
+        self._context = None
+        self._browser = None
+        # The Playwright driver outlives the browser, so stop it in the background
+        playwright = getattr(self, '_playwright', None)
+        self._playwright = None
+        if playwright is not None:
+            asyncio.ensure_future(self._stop_playwright(playwright))
+
+    @staticmethod
+    async def _stop_playwright(playwright):
+        """Stop a Playwright driver whose browser has already gone away"""
+        try:
+            await playwright.stop()
+        except Exception as e:
+            logger.exception(f"Error stopping Playwright: {str(e)}")
+
+    async def _new_page(self) -> Page:
+        """Create a new page with timeouts set"""
+        logger.info("Creating new page")
+        page = await self._context.new_page()
+        # Set longer timeouts for stability
+        logger.debug("Setting page timeouts")
+        page.set_default_timeout(30000)  # 30 seconds
+        page.set_default_navigation_timeout(30000)
+        return page
+    
     @asynccontextmanager
-    async def get_page(self) -> AsyncGenerator[Page, None]:
+    async def get_page(self, agentql: bool = False) -> AsyncGenerator[Page, None]:
         """
-        Get a new page with AgentQL initialized.
+        Get a page, reusing an idle pooled page when available.
+        Pass agentql=True to get the page wrapped with AgentQL for query_data.
         Usage:
             async with browser_ctx.get_page() as page:
                 # Use page here
         """
-        if not self._context:
-            logger.info("No browser context found, initializing")
-            await self._initialize()
-            
-        logger.info("Creating new page")
-        page = await self._context.new_page()
-        wrapped_page = None
-        try:
-            # Set longer timeouts for stability
-            logger.debug("Setting page timeouts")
-            page.set_default_timeout(30000)  # 30 seconds
-            page.set_default_navigation_timeout(30000)
-            
-            # Initialize AgentQL by wrapping the page
-            logger.debug("Wrapping page with AgentQL")
+        # Cap concurrent pages so bursts of lookups do not thrash Chromium
+        async with self._page_sem:
+            # The browser may have disconnected while we waited. This instance is no
+            # longer the singleton then, so fail like Playwright would instead of
+            # launching a browser nothing would ever close.
+            if self._context is None:
+                raise TargetClosedError("Browser context has been closed")
             try:
-                # Use wrap_async for async code
-                wrapped_page = await wrap_async(page)
-                logger.info("Successfully wrapped page with AgentQL")
-                yield wrapped_page
-            except Exception as e:
-                logger.error(f"Error wrapping page with AgentQL: {str(e)}")
-                logger.error(f"Stack trace: {traceback.format_exc()}")
-                raise
-        finally:
+                page = self._page_pool.get_nowait()
+                logger.debug("Reusing pooled page")
+            except asyncio.QueueEmpty:
+                page = await self._new_page()
+        
             try:
-                # Small delay before closing to ensure operations complete
-                logger.debug("Waiting before closing page")
-                await asyncio.sleep(0.5)
-                
-                if wrapped_page:
-                    logger.info("Closing wrapped page")
-                    await wrapped_page.close()
-                elif not page.is_closed():
-                    logger.info("Closing unwrapped page")
-                    await page.close()
-            except Exception as e:
-                logger.error(f"Error closing page: {str(e)}")
-                logger.error(f"Stack trace: {traceback.format_exc()}")
+                if agentql:
+                    # Initialize AgentQL by wrapping the page
+                    logger.debug("Wrapping page with AgentQL")
+                    try:
+                        # Use wrap_async for async code
+                        wrapped_page = await wrap_async(page)
+                        logger.info("Successfully wrapped page with AgentQL")
+                    except Exception as e:
+                        logger.exception(f"Error wrapping page with AgentQL: {str(e)}")
+                        raise
+                    yield wrapped_page
+                else:
+                    yield page
+            finally:
+                try:
+                    if page.is_closed():
+                        logger.debug("Page was closed during use, not returning it to the pool")
+                    else:
+                        # Reset the page so the next user starts from a blank document
+                        await page.goto("about:blank")
+                        try:
+                            self._page_pool.put_nowait(page)
+                        except asyncio.QueueFull:
+                            logger.info("Page pool full, closing transient page")
+                            await page.close()
+                except Exception as e:
+                    logger.exception(f"Error releasing page: {str(e)}")
+                    try:
+                        if not page.is_closed():
+                            await page.close()
+                    except Exception:
+                        # The browser is gone; do not mask the error raised inside the block
+                        pass
     
+    @classmethod
+    async def reset_if_disconnected(cls):
+        """Close the shared browser if it is no longer connected so the next caller relaunches it"""
+        instance = cls._instance
+        if instance is not None and (instance._browser is None or not instance._browser.is_connected()):
+            logger.info("Browser is no longer connected, resetting")
+            await cls.close()
+
     @classmethod
     async def close(cls):
         """Close browser and cleanup"""
-        if cls._instance:
+        instance = cls._instance
+        if instance:
+            # An intentional close also fires "disconnected"; the handler must not race us
+            instance._closing = True
             try:
-                if cls._instance._context:
+                pool = instance._page_pool
+                if not pool.empty():
+                    logger.info("Closing pooled pages")
+                while not pool.empty():
+                    page = pool.get_nowait()
+                    if not page.is_closed():
+                        await page.close()
+                if instance._context:
                     logger.info("Closing browser context")
-                    await cls._instance._context.close()
-                if cls._instance._browser:
+                    await instance._context.close()
+                if instance._browser:
                     logger.info("Closing browser")
-                    await cls._instance._browser.close()
-                if hasattr(cls._instance, '_playwright'):
+                    await instance._browser.close()
+                if getattr(instance, '_playwright', None):
                     logger.info("Stopping Playwright")
-                    await cls._instance._playwright.stop()
+                    await instance._playwright.stop()
             except Exception as e:
-                logger.error(f"Error during cleanup: {str(e)}")
-                logger.error(f"Stack trace: {traceback.format_exc()}")
+                logger.exception(f"Error during cleanup: {str(e)}")
             finally:
                 logger.info("Resetting browser context instance")
-                if hasattr(cls._instance, '_playwright'):
-                    cls._instance._playwright = None
-                cls._instance._context = None
-                cls._instance._browser = None
-                cls._instance = None
+                instance._playwright = None
+                instance._context = None
+                instance._browser = None
+                if cls._instance is instance:
+                    cls._instance = None
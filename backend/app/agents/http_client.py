@@ -0,0 +1,26 @@
+import aiohttp
+from typing import Optional
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+_session: Optional[aiohttp.ClientSession] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+    Reusing one session keeps TCP/TLS connections and DNS lookups warm across requests.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _session
+
+async def close_session():
+    """Close the shared aiohttp session"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
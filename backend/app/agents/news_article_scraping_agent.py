@@ -1,11 +1,88 @@
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from html.parser import HTMLParser
+from typing import Dict, Any, List, Optional
+import asyncio
 import re
 import logging
+import aiohttp
+from playwright._impl._errors import TimeoutError
 from .browser_context import BrowserContext
+from .http_client import get_session, USER_AGENT
+from .ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Matches the main content container on most news sites
+ARTICLE_READY_SELECTOR = "article, [itemprop='articleBody'], [class*='article-content']"
+
+# Text shown in place of paywalled article content
+PAYWALL_PHRASES = ('Subscribe to read', 'Premium content', 'Subscriber-only')
+
+# Seconds to reuse a scraped article
+ARTICLE_CACHE_TTL = 600
+
+# Maximum number of scraped articles kept in memory
+ARTICLE_CACHE_MAX_ENTRIES = 512
+
+_ARTICLE_CACHE = TTLCache(ARTICLE_CACHE_TTL, ARTICLE_CACHE_MAX_ENTRIES)
+
+# Static HTML fetches shorter than this are retried in the browser
+FAST_PATH_MIN_CONTENT = 500
+
+# Paywall markers, then login/subscription buttons combined with truncated content
+_PAYWALL_DETECTION_JS = """
+(phrases) => {
+    if (document.querySelector("div[class*='paywall'], div[class*='subscribe']")) {
+        return true;
+    }
+    const bodyText = document.body ? document.body.innerText : '';
+    if (phrases.some(phrase => bodyText.includes(phrase))) {
+        return true;
+    }
+    const buttons = Array.from(document.querySelectorAll('button'));
+    if (buttons.some(button => /subscribe|sign in/i.test(button.innerText))) {
+        // Verify if main content is hidden/truncated
+        const article = document.querySelector('article');
+        return article !== null && article.innerText.length < 500;  // Typical paywall preview length
+    }
+    return false;
+}
+"""
+
+# Fallback content containers, in order of preference
+CONTENT_SELECTORS = [
+    "article",
+    "div[class*='article-content']",
+    "div[class*='story-content']",
+    "div[class*='post-content']",
+    "div[itemprop='articleBody']"
+]
+
+# innerText of the first element matching each selector, or null if absent
+_CONTENT_CANDIDATES_JS = """
+(selectors) => selectors.map(selector => {
+    const el = document.querySelector(selector);
+    return el ? el.innerText : null;
+})
+"""
+
+# Date formats tried by standardize_date when the fast paths do not apply, in order
+DATE_FORMATS = ("%b %d, %Y", "%Y-%m-%d", "%d/%m/%Y")
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NUMBER_RE = re.compile(r'\d+')
+
+# Common noise patterns, removed in a single pass. Trailing matches stop at the
+# end of the line so a "Read more" link does not swallow the rest of the article.
+_NOISE_RE = re.compile(
+    r'Advertisement\s*'
+    r'|Subscribe now[^\n]*'
+    r'|Sign up[^\n]*'
+    r'|Read more[^\n]*'
+    r'|©\s*\d{4}[^\n]*',  # Copyright notices
+    re.IGNORECASE
+)
+
 def standardize_date(date_str: str) -> Optional[str]:
     """
     Converts various date formats to ISO format (YYYY-MM-DD).
@@ -22,25 +99,31 @@ def standardize_date(date_str: str) -> Optional[str]:
     date_str = date_str.strip().lower()
     
     # Handle relative dates
-    if "ago" in date_str:
-        now = datetime.now()
-        if "h" in date_str:  # hours ago
-            hours = int(re.search(r'\d+', date_str).group())
-            return (now - timedelta(hours=hours)).isoformat()
-        elif "d" in date_str:  # days ago
-            days = int(re.search(r'\d+', date_str).group())
-            return (now - timedelta(days=days)).isoformat()
-            
+    if date_str.endswith("ago"):
+        match = _NUMBER_RE.search(date_str)
+        if match:
+            amount = int(match.group())
+            now = datetime.now()
+            if "h" in date_str:  # hours ago
+                return (now - timedelta(hours=amount)).isoformat()
+            elif "d" in date_str:  # days ago
+                return (now - timedelta(days=amount)).isoformat()
+    
+    # Zero-padded numeric dates are parsed directly from their shape
     try:
-        # Try parsing with different formats
-        for fmt in ["%b %d, %Y", "%Y-%m-%d", "%d/%m/%Y"]:
-            try:
-                return datetime.strptime(date_str, fmt).isoformat()
-            except ValueError:
-                continue
-    except Exception:
-        return None
+        if len(date_str) >= 10 and date_str[4] == '-':  # 2025-02-15
+            return datetime.fromisoformat(date_str[:10]).isoformat()
+        if len(date_str) == 10 and date_str[2] == '/' and date_str[5] == '/':  # 15/02/2025
+            return datetime(int(date_str[6:]), int(date_str[3:5]), int(date_str[:2])).isoformat()
+    except ValueError:
+        pass
     
+    # Textual and unpadded dates such as "Feb 15, 2025" or "1/2/2025"
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).isoformat()
+        except ValueError:
+            continue
     return None
 
 def clean_text(text: str) -> str:
@@ -50,65 +133,130 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
-    
-    # Remove common noise patterns
-    patterns_to_remove = [
-        r'Advertisement\s*',
-        r'Subscribe now.*',
-        r'Sign up.*',
-        r'Read more.*',
-        r'©\s*\d{4}.*',  # Copyright notices
-    ]
-    
-    for pattern in patterns_to_remove:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    # Remove common noise patterns while line breaks still bound them,
+    # then collapse extra whitespace
+    text = _NOISE_RE.sub('', text)
+    text = _WHITESPACE_RE.sub(' ', text.strip())
     
     return text.strip()
 
 async def is_paywall_detected(page) -> bool:
     """
     Detects if an article is behind a paywall using multiple detection methods.
+    All checks run in the page in a single round-trip.
     """
-    paywall_indicators = [
-        "//div[contains(text(), 'Subscribe to read')]",
-        "//div[contains(text(), 'Premium content')]",
-        "//div[contains(text(), 'Subscriber-only')]",
-        "//div[contains(@class, 'paywall')]",
-        "//div[contains(@class, 'subscribe')]",
-    ]
-    
     try:
-        for indicator in paywall_indicators:
-            if await page.locator(indicator).count() > 0:
-                return True
-                
-        # Check for login/subscription buttons
-        login_buttons = await page.locator("button:has-text('Subscribe'), button:has-text('Sign in')").count()
-        if login_buttons > 0:
-            # Verify if main content is hidden/truncated
-            article_text = await page.locator("article").inner_text()
-            if len(article_text) < 500:  # Typical paywall preview length
-                return True
+        return await page.evaluate(_PAYWALL_DETECTION_JS, list(PAYWALL_PHRASES))
     except Exception as e:
         logger.error(f"Error in paywall detection: {str(e)}")
         
     return False
 
+class _ArticleTextParser(HTMLParser):
+    """Collects the text inside <article> elements, skipping scripts and styles."""
+    
+    BLOCK_TAGS = frozenset({'p', 'div', 'br', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section'})
+    SKIP_TAGS = frozenset({'script', 'style', 'noscript'})
+    
+    def __init__(self):
+        super().__init__()
+        self.article_depth = 0
+        self.skip_depth = 0
+        self.parts: List[str] = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'article':
+            self.article_depth += 1
+        elif tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag == 'article' and self.article_depth:
+            self.article_depth -= 1
+        elif tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        # Keep block boundaries so clean_text can remove noise line by line
+        if self.article_depth and tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+    
+    def handle_data(self, data):
+        if self.article_depth and not self.skip_depth:
+            self.parts.append(data)
+
+def _extract_article_text(html: str) -> str:
+    """Extract the text of the <article> elements in an HTML document."""
+    parser = _ArticleTextParser()
+    parser.feed(html)
+    parser.close()
+    return ''.join(parser.parts)
+
+async def _fast_scrape(url: str) -> Optional[str]:
+    """
+    Fetches url as static HTML and extracts the article text without a browser.
+    Returns None when the page needs a browser: fetch errors, non-HTML responses,
+    too little content or paywall text.
+    """
+    try:
+        session = await get_session()
+        async with session.get(
+            url,
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=3)
+        ) as response:
+            if response.status != 200 or 'html' not in response.content_type:
+                return None
+            html = await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+        logger.debug(f"Static fetch failed for {url}: {str(e)}")
+        return None
+    
+    # Parsing a full page is CPU work, so keep it off the event loop
+    content = clean_text(await asyncio.to_thread(_extract_article_text, html))
+    if len(content) < FAST_PATH_MIN_CONTENT or any(phrase in content for phrase in PAYWALL_PHRASES):
+        return None
+    return content
+
 async def scrape_article_content(url: str) -> Dict[str, Any]:
+    """
+    Extracts full article content, reusing results for ARTICLE_CACHE_TTL
+    seconds since the same stories show up across ticker reports.
+    Concurrent misses for the same URL share a single scrape.
+    """
+    # Only cache usable results so transient failures are retried
+    return await _ARTICLE_CACHE.get_or_load(
+        url,
+        lambda: _scrape_article_content(url),
+        lambda result: not result.get("error")
+    )
+
+async def _scrape_article_content(url: str) -> Dict[str, Any]:
     """
     Extracts full article content using a hybrid approach:
-    1. AgentQL for smart content detection and structure analysis
-    2. Playwright selectors as fallback
+    1. Static HTML fetch for pages that do not need JavaScript
+    2. AgentQL for smart content detection and structure analysis
+    3. Playwright selectors as fallback
     """
     logger.info(f"Scraping article content from: {url}")
+    content = await _fast_scrape(url)
+    if content:
+        logger.info(f"Extracted article content without a browser: {url}")
+        return {
+            "url": url,
+            "is_paywalled": False,
+            "content": content,
+            "content_length": len(content)
+        }
+    
     browser_ctx = await BrowserContext.get_instance()
     
-    async with browser_ctx.get_page() as page:
+    async with browser_ctx.get_page(agentql=True) as page:
         try:
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            await page.wait_for_load_state('networkidle')
+            await page.goto(url, wait_until='domcontentloaded', timeout=8000)
+            try:
+                # Wait for the article body rather than for the network to go idle
+                await page.wait_for_selector(ARTICLE_READY_SELECTOR, timeout=3000)
+            except TimeoutError:
+                logger.debug(f"Article body not found for {url}, continuing with loaded content")
             
             # Check for paywall
             if await is_paywall_detected(page):
@@ -148,26 +296,19 @@ async def scrape_article_content(url: str) -> Dict[str, Any]:
             except Exception as e:
                 logger.warning(f"AgentQL extraction failed, falling back to selectors: {str(e)}")
             
-            # Fallback to traditional selectors
-            content_selectors = [
-                "article",
-                "div[class*='article-content']",
-                "div[class*='story-content']",
-                "div[class*='post-content']",
-                "div[itemprop='articleBody']"
-            ]
-            
-            for selector in content_selectors:
-                content_el = await page.locator(selector).first
-                if content_el:
-                    content = clean_text(await content_el.inner_text())
-                    if len(content) > 200:  # Minimum content length threshold
-                        return {
-                            "url": url,
-                            "is_paywalled": False,
-                            "content": content,
-                            "content_length": len(content)
-                        }
+            # Fallback to traditional selectors, probed in a single round-trip
+            candidates = await page.evaluate(_CONTENT_CANDIDATES_JS, CONTENT_SELECTORS)
+            for text in candidates:
+                if text is None:
+                    continue
+                content = clean_text(text)
+                if len(content) > 200:  # Minimum content length threshold
+                    return {
+                        "url": url,
+                        "is_paywalled": False,
+                        "content": content,
+                        "content_length": len(content)
+                    }
             
             return {
                 "url": url,
@@ -1,16 +1,79 @@
 from datetime import datetime
 from typing import List, Dict, Any
 import asyncio
+import random
 from .browser_context import BrowserContext
+from .sentiment import analyze_sentiment
+from .ttl_cache import TTLCache
 from playwright._impl._errors import TimeoutError, Error, TargetClosedError
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
+# News lists change on a minute scale, so results are reused for this many seconds
+NEWS_CACHE_TTL = 300
+
+# Maximum number of queries whose articles are kept in memory
+NEWS_CACHE_MAX_ENTRIES = 256
+
+_NEWS_CACHE = TTLCache(NEWS_CACHE_TTL, NEWS_CACHE_MAX_ENTRIES)
+
+# Single DOM walk returning every article under the given selectors
+_EXTRACT_ARTICLES_JS = """
+(selectors) => Array.from(document.querySelectorAll(selectors.title)).map(heading => {
+    const item = heading.closest(selectors.item) || heading.parentElement;
+    const text = (selector) => {
+        const el = selector ? item.querySelector(selector) : null;
+        return el ? el.innerText.trim() : '';
+    };
+    const link = heading.closest('a[href]') || item.querySelector('a[href]');
+    return {
+        title: heading.innerText.trim(),
+        url: link ? link.href : '',
+        description: text('p'),
+        source: text(selectors.source),
+        time: text(selectors.time)
+    };
+}).filter(article => article.title && article.url)
+"""
+
+_YAHOO_SELECTORS = {
+    'title': '#marketsNews h3',
+    'item': 'li',
+    'source': 'span.caas-author',
+    'time': 'span.caas-timestamp',
+}
+
+_REUTERS_SELECTORS = {
+    'title': 'h3',
+    'item': 'li, article',
+    'source': 'div.article-info',
+    'time': 'time',
+}
+
+async def _wait_for_articles(page, selector: str) -> None:
+    """
+    Waits until the article list is in the DOM instead of sleeping a fixed time.
+    Falls back to a short network-idle wait when the selector does not show up.
+    """
+    try:
+        await page.wait_for_selector(selector, timeout=5000)
+    except TimeoutError:
+        logger.debug(f"Selector {selector} not found, waiting for network idle")
+        try:
+            await page.wait_for_load_state("networkidle", timeout=3000)
+        except TimeoutError:
+            logger.debug("Network did not go idle, extracting what has loaded")
+
+def _retry_delay(retry_count: int) -> float:
+    """Exponential backoff capped at 8s, with jitter so concurrent callers spread out."""
+    return min(8, 0.25 * 2 ** retry_count) * (0.5 + random.random())
+
 async def fetch_news_links(query: str, max_retries: int = 3) -> List[Dict[str, Any]]:
     """
     Fetches financial news links for a given query, prioritizing accessible sources.
+    Results are cached per query for NEWS_CACHE_TTL seconds, and concurrent
+    misses for the same query share a single browser session.
     
     Args:
         query: Stock ticker or company name
@@ -19,6 +82,33 @@ async def fetch_news_links(query: str, max_retries: int = 3) -> List[Dict[str, A
     Returns:
         List of news article information
     """
+    articles = _NEWS_CACHE.get(query)
+    if articles is not None:
+        logger.info(f"Returning cached news for query: {query}")
+        return articles
+    # Empty results are not cached, so a failed scrape is retried on the next call
+    return await _NEWS_CACHE.get_or_load(query, lambda: _scrape_news_links(query, max_retries))
+
+async def _scrape_news_links(query: str, max_retries: int) -> List[Dict[str, Any]]:
+    """
+    Scrapes news links for query, relaunching the browser once if it has died.
+    Retrying on a closed browser cannot succeed, so TargetClosedError is not
+    part of the normal retry loop.
+    """
+    try:
+        return await _scrape_news_links_once(query, max_retries)
+    except TargetClosedError as e:
+        logger.warning(f"Browser closed while fetching news, reinitializing once: {str(e)}")
+        await BrowserContext.reset_if_disconnected()
+    
+    try:
+        return await _scrape_news_links_once(query, max_retries)
+    except TargetClosedError as e:
+        logger.exception(f"Browser closed again while fetching news, giving up: {str(e)}")
+        return []
+
+async def _scrape_news_links_once(query: str, max_retries: int) -> List[Dict[str, Any]]:
+    """Scrapes news links for query from Yahoo Finance, falling back to Reuters."""
     logger.info(f"Fetching news for query: {query}")
     browser_ctx = await BrowserContext.get_instance()
     
@@ -31,30 +121,23 @@ async def fetch_news_links(query: str, max_retries: int = 3) -> List[Dict[str, A
                 # Target Yahoo Finance first
                 yahoo_url = f"https://finance.yahoo.com/quote/{query}/news"
                 logger.info(f"Attempting to navigate to Yahoo Finance: {yahoo_url}")
-                await page.goto(yahoo_url, wait_until='domcontentloaded', timeout=30000)
-                await asyncio.sleep(2)  # Small delay to ensure content loads
+                await page.goto(yahoo_url, wait_until='domcontentloaded', timeout=15000)
                 
                 # Extract news links from Yahoo Finance using specific selectors
                 try:
-                    logger.debug("Querying Yahoo Finance with AgentQL")
-                    results = await page.query_data("""
-                    {
-                        news_section(must be div with id="marketsNews") {
-                            articles[] {
-                                title(must be h3 text)
-                                url(must be a href)
-                                description(must be p text)
-                                source(must be span with class="caas-author")
-                                time(must be span with class="caas-timestamp")
-                            }
+                    await _wait_for_articles(page, _YAHOO_SELECTORS['title'])
+                    logger.debug("Extracting Yahoo Finance articles from the DOM")
+                    results = {
+                        'news_section': {
+                            'articles': await page.evaluate(_EXTRACT_ARTICLES_JS, _YAHOO_SELECTORS)
                         }
                     }
-                    """)
-                    if results and results.get('news_section', {}).get('articles'):
+                    if results['news_section']['articles']:
                         logger.info("Successfully retrieved articles from Yahoo Finance")
-                except (Error, TargetClosedError) as e:
-                    logger.error(f"Error querying Yahoo Finance: {str(e)}")
-                    logger.error(f"Stack trace: {traceback.format_exc()}")
+                except TargetClosedError:
+                    raise
+                except Error as e:
+                    logger.exception(f"Error querying Yahoo Finance: {str(e)}")
                     results = None
                 
                 # If Yahoo fails, try Reuters
@@ -62,107 +145,74 @@ async def fetch_news_links(query: str, max_retries: int = 3) -> List[Dict[str, A
                     logger.info("Yahoo Finance failed, trying Reuters...")
                     reuters_url = f"https://www.reuters.com/markets/companies/{query}.O"
                     logger.info(f"Attempting to navigate to Reuters: {reuters_url}")
-                    await page.goto(reuters_url, wait_until='domcontentloaded', timeout=30000)
-                    await asyncio.sleep(2)  # Small delay to ensure content loads
+                    await page.goto(reuters_url, wait_until='domcontentloaded', timeout=15000)
                     
                     try:
-                        logger.debug("Querying Reuters with AgentQL")
-                        results = await page.query_data("""
-                        {
-                            articles[] {
-                                title(must be h3 text)
-                                url(must be a href)
-                                description(must be p text)
-                                source(must be div with class="article-info" text)
-                                time(must be time text)
-                            }
+                        await _wait_for_articles(page, _REUTERS_SELECTORS['title'])
+                        logger.debug("Extracting Reuters articles from the DOM")
+                        results = {
+                            'articles': await page.evaluate(_EXTRACT_ARTICLES_JS, _REUTERS_SELECTORS)
                         }
-                        """)
                         if results and results.get('articles'):
                             logger.info("Successfully retrieved articles from Reuters")
-                    except (Error, TargetClosedError) as e:
-                        logger.error(f"Error querying Reuters: {str(e)}")
-                        logger.error(f"Stack trace: {traceback.format_exc()}")
+                    except TargetClosedError:
+                        raise
+                    except Error as e:
+                        logger.exception(f"Error querying Reuters: {str(e)}")
                         results = None
             
-            except (TimeoutError, TargetClosedError) as e:
-                logger.error(f"Navigation error on attempt {retry_count + 1}: {str(e)}")
-                logger.error(f"Stack trace: {traceback.format_exc()}")
+            except TargetClosedError:
+                # The page or browser is gone; the caller reinitializes instead of retrying here
+                raise
+                
+            except TimeoutError as e:
+                logger.exception(f"Navigation error on attempt {retry_count + 1}: {str(e)}")
+                await asyncio.sleep(_retry_delay(retry_count))  # Wait before retry
                 retry_count += 1
-                await asyncio.sleep(1)  # Wait before retry
                 continue
                 
             except Exception as e:
-                logger.error(f"Unexpected error on attempt {retry_count + 1}: {str(e)}")
-                logger.error(f"Stack trace: {traceback.format_exc()}")
+                logger.exception(f"Unexpected error on attempt {retry_count + 1}: {str(e)}")
+                await asyncio.sleep(_retry_delay(retry_count))  # Wait before retry
                 retry_count += 1
-                await asyncio.sleep(1)  # Wait before retry
                 continue
         
         # Process results
         articles = []
+        now_iso = datetime.now().isoformat()  # Same fetch time for the whole batch
         if results:
             if results.get('news_section', {}).get('articles'):  # Yahoo Finance format
                 logger.info(f"Processing {len(results['news_section']['articles'])} articles from Yahoo Finance")
                 for article in results['news_section']['articles']:
-                    # Basic sentiment inference from title and description
-                    title = article.get('title', '').lower()
-                    description = article.get('description', '').lower()
-                    sentiment = 'neutral'
-                    
-                    # Simple keyword-based sentiment analysis
-                    positive_words = {'rise', 'gain', 'up', 'growth', 'positive', 'bullish', 'surge', 'jump', 'strong', 'beat'}
-                    negative_words = {'fall', 'drop', 'down', 'decline', 'negative', 'bearish', 'plunge', 'weak', 'miss', 'loss'}
+                    title = article.get('title', '')
+                    description = article.get('description', '')
                     
-                    text = title + ' ' + description
-                    pos_count = sum(1 for word in positive_words if word in text)
-                    neg_count = sum(1 for word in negative_words if word in text)
-                    
-                    if pos_count > neg_count:
-                        sentiment = 'positive'
-                    elif neg_count > pos_count:
-                        sentiment = 'negative'
+                    # Basic sentiment inference from title and description
+                    sentiment = analyze_sentiment(title + ' ' + description)
                     
                     articles.append({
-                        "headline": article.get('title', ''),
-                        "summary": article.get('description', '')[:200] + "...",
+                        "headline": title,
+                        "summary": description[:200] + "...",
                         "url": article.get('url', ''),
                         "source": article.get('source', 'Yahoo Finance'),
-                        "published_at": datetime.now().isoformat(),  # Store as ISO format string
+                        "published_at": now_iso,  # Store as ISO format string
                         "sentiment": sentiment
                     })
             elif results.get('articles'):  # Reuters format
                 logger.info(f"Processing {len(results['articles'])} articles from Reuters")
                 for article in results['articles']:
-                    # Convert relative Reuters URLs to absolute
-                    url = article.get('url', '')
-                    if url.startswith('/'):
-                        url = f"https://www.reuters.com{url}"
+                    title = article.get('title', '')
+                    description = article.get('description', '')
                     
                     # Basic sentiment inference from title and description
-                    title = article.get('title', '').lower()
-                    description = article.get('description', '').lower()
-                    sentiment = 'neutral'
-                    
-                    # Simple keyword-based sentiment analysis
-                    positive_words = {'rise', 'gain', 'up', 'growth', 'positive', 'bullish', 'surge', 'jump', 'strong', 'beat'}
-                    negative_words = {'fall', 'drop', 'down', 'decline', 'negative', 'bearish', 'plunge', 'weak', 'miss', 'loss'}
-                    
-                    text = title + ' ' + description
-                    pos_count = sum(1 for word in positive_words if word in text)
-                    neg_count = sum(1 for word in negative_words if word in text)
-                    
-                    if pos_count > neg_count:
-                        sentiment = 'positive'
-                    elif neg_count > pos_count:
-                        sentiment = 'negative'
+                    sentiment = analyze_sentiment(title + ' ' + description)
                         
                     articles.append({
-                        "headline": article.get('title', ''),
-                        "summary": article.get('description', '')[:200] + "...",
-                        "url": url,
+                        "headline": title,
+                        "summary": description[:200] + "...",
+                        "url": article.get('url', ''),
                         "source": "Reuters",
-                        "published_at": datetime.now().isoformat(),  # Store as ISO format string
+                        "published_at": now_iso,  # Store as ISO format string
                         "sentiment": sentiment
                     })
         
@@ -1,8 +1,11 @@
 import os
-import json
+import asyncio
+import functools
+import hashlib
 import logging
+import orjson
 import yfinance as yf
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 import google.generativeai as genai
 from datetime import datetime, timedelta
 
@@ -11,6 +14,7 @@ import weave
 from .news_lookup_agent import fetch_news_links
 from .news_article_scraping_agent import scrape_article_content
 from .youtube_agent import fetch_stock_videos
+from .ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +24,203 @@ wandb.login(key=os.getenv('WANDB_API_KEY'))
 # Initialize Weave
 weave.init('stock-analysis')
 
+# Company info and monthly history change slowly, so reuse them for this many seconds
+STOCK_DATA_CACHE_TTL = 300
+
+# Number of top news articles whose full content is scraped for the prompt
+ARTICLES_TO_SCRAPE = 3
+
+# Short text fields are capped before they are serialized into the prompt
+PROMPT_TEXT_LIMIT = 200
+
+# Gemini responses are reused for an identical prompt for this many seconds
+RESPONSE_CACHE_TTL = 4 * 60 * 60
+
+# Maximum number of Gemini responses kept in memory
+RESPONSE_CACHE_MAX_ENTRIES = 128
+
+_RESPONSE_CACHE = TTLCache(RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES)
+
+# yfinance lookups allowed in flight at once; each one occupies two worker threads
+MAX_CONCURRENT_STOCK_LOOKUPS = 8
+
+# Maximum number of tickers whose info and history are kept in memory
+STOCK_DATA_CACHE_MAX_ENTRIES = 256
+
+_STOCK_DATA_CACHE = TTLCache(STOCK_DATA_CACHE_TTL, STOCK_DATA_CACHE_MAX_ENTRIES)
+# Created on first use so it belongs to the running event loop
+_stock_lookup_sem: Optional[asyncio.Semaphore] = None
+
+def _to_prompt_json(data: Any) -> str:
+    """Serialize prompt data as compact JSON; pandas values may be numpy scalars."""
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+async def _load_stock_data(ticker: str) -> Tuple[Dict[str, Any], Any]:
+    """Look up company info and one month of history in parallel.
+    
+    The two hit separate Yahoo endpoints, and yfinance requests are synchronous,
+    so each runs in its own thread to keep them off the event loop.
+    """
+    global _stock_lookup_sem
+    if _stock_lookup_sem is None:
+        _stock_lookup_sem = asyncio.Semaphore(MAX_CONCURRENT_STOCK_LOOKUPS)
+    # Bound thread use so a burst of tickers cannot starve the default executor
+    async with _stock_lookup_sem:
+        stock = yf.Ticker(ticker)
+        info, history = await asyncio.gather(
+            asyncio.to_thread(getattr, stock, 'info'),
+            asyncio.to_thread(stock.history, period="1mo")
+        )
+    return info, history
+
+async def fetch_stock_data(ticker: str) -> Tuple[Dict[str, Any], Any]:
+    """Fetch comprehensive stock data using yfinance.
+    
+    The service and the report generator ask for the same ticker at the same
+    time, so concurrent misses share a single lookup.
+    """
+    data = _STOCK_DATA_CACHE.get(ticker)
+    if data is not None:
+        logger.info(f"Returning cached stock data for {ticker}")
+        return data
+    return await _STOCK_DATA_CACHE.get_or_load(ticker, lambda: _load_stock_data(ticker))
+
+@functools.lru_cache(maxsize=1)
+def _get_model() -> genai.GenerativeModel:
+    """Configure Gemini once and share the model across generator instances."""
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai.GenerativeModel('gemini-pro')
+
 class StockReportGenerator:
     def __init__(self):
         """Initialize the report generator."""
         # Initialize Gemini
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-pro')
+        self.model = _get_model()
     
-    async def fetch_stock_data(self, ticker: str) -> Dict[str, Any]:
+    async def fetch_stock_data(self, ticker: str) -> Tuple[Dict[str, Any], Any]:
         """Fetch comprehensive stock data using yfinance."""
-        stock = yf.Ticker(ticker)
-        return stock.info, stock.history(period="1mo")
+        return await fetch_stock_data(ticker)
+
+    async def _fetch_news_with_content(self, ticker: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch news links, then scrape full content for the most recent articles concurrently."""
+        news_articles = await fetch_news_links(ticker)
+        
+        # Page concurrency is bounded by BrowserContext, so all scrapes can start at once
+        top_articles = news_articles[:ARTICLES_TO_SCRAPE]
+        article_contents = await asyncio.gather(
+            *(scrape_article_content(article['url']) for article in top_articles),
+            return_exceptions=True
+        )
+        
+        detailed_articles = []
+        for article, article_content in zip(top_articles, article_contents):
+            if isinstance(article_content, Exception):
+                logger.warning(f"Error scraping {article.get('url', '')}: {str(article_content)}")
+                continue
+            if article_content and article_content.get('content'):
+                detailed_articles.append({
+                    'headline': article.get('headline', ''),
+                    'url': article.get('url', ''),
+                    'content': article_content['content']
+                })
+        return news_articles, detailed_articles
+
+    async def _build_prompt(self, ticker: str) -> str:
+        """Gather stock data, news and videos for ticker and format the Gemini prompt."""
+        # Stock data, news (with article scraping) and videos are independent,
+        # so article scraping overlaps with the stock data and video lookups
+        (info, history), (news_articles, detailed_articles), videos = await asyncio.gather(
+            self.fetch_stock_data(ticker),
+            self._fetch_news_with_content(ticker),
+            fetch_stock_videos(ticker)
+        )
+        
+        # Prepare data for the prompt
+        recent_prices = history.tail(10)[['Close']].to_dict()['Close']
+        # Convert timestamps to strings; full float precision only adds prompt tokens
+        recent_prices = {k.strftime('%Y-%m-%d'): round(v, 2) for k, v in recent_prices.items()}
+        
+        # Prepare article data with truncated content
+        article_data = [{
+            'headline': article['headline'],
+            'content': article['content'][:1000]
+        } for article in detailed_articles]
+        
+        # Serialize prompt data compactly; indentation only adds tokens
+        prices_json = _to_prompt_json(recent_prices)
+        news_json = _to_prompt_json([{
+            'headline': article.get('headline', '')[:PROMPT_TEXT_LIMIT],
+            'summary': article.get('summary', '')[:PROMPT_TEXT_LIMIT],
+            'source': article.get('source', ''),
+            'time': article.get('published_at', '')
+        } for article in news_articles[:5]])
+        articles_json = _to_prompt_json(article_data)
+        videos_json = _to_prompt_json([{
+            'title': video.get('title', '')[:PROMPT_TEXT_LIMIT],
+            'channel': video.get('channel', '')
+        } for video in videos[:5]])
+        
+        # Format the data for the prompt
+        prompt = f"""You are a professional stock analyst. Generate a comprehensive analysis report for {ticker} stock.
+        Use the following data to create your analysis:
+
+        Stock Information:
+        - Current Price: ${info.get('currentPrice', 'N/A')}
+        - Market Cap: ${info.get('marketCap', 0) / 1e9:.2f}B
+        - P/E Ratio: {info.get('forwardPE', 'N/A')}
+        - 52 Week Range: ${info.get('fiftyTwoWeekLow', 'N/A')} - ${info.get('fiftyTwoWeekHigh', 'N/A')}
+
+        Recent Price History:
+        {prices_json}
+
+        Recent News Articles:
+        {news_json}
+
+        Detailed Article Analysis:
+        {articles_json}
+
+        Recent YouTube Coverage:
+        {videos_json}
+
+        Format your report with these sections:
+        1. Technical Analysis
+        2. News Sentiment (including insights from full article content)
+        3. Social Media Analysis
+        4. Fundamental Analysis
+        5. Actionable Summary
+        6. Potential Risks/Opportunities
+        """
+        return prompt
+
+    async def stream_report(self, ticker: str) -> AsyncIterator[str]:
+        """
+        Generate a stock analysis report, yielding text as Gemini produces it.
+        
+        Args:
+            ticker: Stock symbol to analyze
+        
+        Yields:
+            str: Successive chunks of the report text
+        """
+        prompt = await self._build_prompt(ticker)
+        
+        # Identical inputs produce an identical prompt, so reuse the earlier answer
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is not None:
+            logger.info(f"Returning cached Gemini response for {ticker}")
+            yield cached
+            return
+        
+        # Stream the response so callers can show progress before the report is complete
+        response = await self.model.generate_content_async(prompt, stream=True)
+        chunks = []
+        async for chunk in response:
+            chunks.append(chunk.text)
+            yield chunk.text
+        
+        # Only complete responses are cached
+        _RESPONSE_CACHE.set(key, ''.join(chunks))
 
     @weave.op()  # Track this operation with Weave
     async def generate_report(self, ticker: str) -> str:
@@ -44,86 +234,7 @@ class StockReportGenerator:
             str: Generated report text
         """
         try:
-            # Get stock data
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            history = stock.history(period="1mo")
-            
-            # Get recent news articles
-            news_articles = await fetch_news_links(ticker)
-            
-            # Get full content for top 3 most recent articles
-            detailed_articles = []
-            for article in news_articles[:3]:
-                article_content = await scrape_article_content(article['url'])
-                if article_content and article_content.get('content'):
-                    detailed_articles.append({
-                        'headline': article.get('title', ''),  
-                        'url': article.get('url', ''),
-                        'content': article_content['content']
-                    })
-            
-            # Get YouTube videos
-            videos = await fetch_stock_videos(ticker)
-            
-            # Prepare data for the prompt
-            recent_prices = history.tail(10)[['Close']].to_dict()['Close']
-            # Convert timestamps to strings
-            recent_prices = {k.strftime('%Y-%m-%d'): v for k, v in recent_prices.items()}
-            
-            # Prepare article data with truncated content
-            article_data = []
-            for article in detailed_articles:
-                content = article['content'][:1000] if len(article['content']) > 1000 else article['content']
-                article_data.append({
-                    'headline': article['headline'],
-                    'content': content
-                })
-            
-            # Format the data for the prompt
-            prompt = f"""You are a professional stock analyst. Generate a comprehensive analysis report for {ticker} stock.
-            Use the following data to create your analysis:
-
-            Stock Information:
-            - Current Price: ${info.get('currentPrice', 'N/A')}
-            - Market Cap: ${info.get('marketCap', 0) / 1e9:.2f}B
-            - P/E Ratio: {info.get('forwardPE', 'N/A')}
-            - 52 Week Range: ${info.get('fiftyTwoWeekLow', 'N/A')} - ${info.get('fiftyTwoWeekHigh', 'N/A')}
-
-            Recent Price History:
-            {json.dumps(recent_prices, indent=2)}
-
-            Recent News Articles:
-            {json.dumps([{
-                'headline': article.get('title', ''),
-                'summary': article.get('description', ''),
-                'source': article.get('source', ''),
-                'time': article.get('time', '')
-            } for article in news_articles[:5]], indent=2)}
-
-            Detailed Article Analysis:
-            {json.dumps(article_data, indent=2)}
-
-            Recent YouTube Coverage:
-            {json.dumps([{
-                'title': video.get('title', ''),
-                'channel': video.get('channel', '')
-            } for video in videos[:5]], indent=2)}
-
-            Format your report with these sections:
-            1. Technical Analysis
-            2. News Sentiment (including insights from full article content)
-            3. Social Media Analysis
-            4. Fundamental Analysis
-            5. Actionable Summary
-            6. Potential Risks/Opportunities
-            """
-
-            # Generate report using Gemini
-            response = self.model.generate_content(prompt)
-            report = response.text
-
-            return report
+            return ''.join([chunk async for chunk in self.stream_report(ticker)])
             
         except Exception as e:
             logger.error(f"Error generating report: {str(e)}")
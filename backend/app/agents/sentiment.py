@@ -0,0 +1,49 @@
+import string
+from typing import Dict, Tuple
+
+# Sentiment keywords and the inflected forms that count as them. Headlines are
+# mostly written as "surges", "fell", "losses", so the stems alone miss them.
+# "up" and "down" stay whole words so "supply" or "sundown" do not match.
+_POSITIVE_FORMS: Dict[str, Tuple[str, ...]] = {
+    'rise': ('rise', 'rises', 'rose', 'risen', 'rising'),
+    'gain': ('gain', 'gains', 'gained', 'gaining', 'gainers'),
+    'up': ('up', 'upgrade', 'upgrades', 'upgraded', 'upside'),
+    'growth': ('growth',),
+    'positive': ('positive',),
+    'bullish': ('bullish',),
+    'surge': ('surge', 'surges', 'surged', 'surging'),
+    'jump': ('jump', 'jumps', 'jumped', 'jumping'),
+    'strong': ('strong', 'stronger', 'strongest'),
+    'beat': ('beat', 'beats', 'beating'),
+}
+_NEGATIVE_FORMS: Dict[str, Tuple[str, ...]] = {
+    'fall': ('fall', 'falls', 'fell', 'fallen', 'falling'),
+    'drop': ('drop', 'drops', 'dropped', 'dropping'),
+    'down': ('down', 'downgrade', 'downgrades', 'downgraded', 'downturn', 'downside'),
+    'decline': ('decline', 'declines', 'declined', 'declining'),
+    'negative': ('negative',),
+    'bearish': ('bearish',),
+    'plunge': ('plunge', 'plunges', 'plunged', 'plunging'),
+    'weak': ('weak', 'weaker', 'weakest', 'weakness'),
+    'miss': ('miss', 'misses', 'missed'),
+    'loss': ('loss', 'losses'),
+}
+
+# Word -> keyword it counts as; each keyword is counted once per text
+_POSITIVE = {form: stem for stem, forms in _POSITIVE_FORMS.items() for form in forms}
+_NEGATIVE = {form: stem for stem, forms in _NEGATIVE_FORMS.items() for form in forms}
+
+# Replace punctuation with spaces so "gain," and "rise." still match as words
+_PUNCTUATION_TO_SPACE = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+def analyze_sentiment(text: str) -> str:
+    """Classify text as 'positive', 'negative' or 'neutral'."""
+    words = set(text.translate(_PUNCTUATION_TO_SPACE).lower().split())
+    pos_count = len({_POSITIVE[word] for word in words if word in _POSITIVE})
+    neg_count = len({_NEGATIVE[word] for word in words if word in _NEGATIVE})
+
+    if pos_count > neg_count:
+        return 'positive'
+    elif neg_count > pos_count:
+        return 'negative'
+    return 'neutral'
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    Bounded in-process cache whose entries expire after a fixed number of seconds.
+    Keys usually come from request input, so the cache never holds more than
+    max_entries: expired entries are dropped first, then the oldest ones.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key if it is still fresh."""
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        del self._entries[key]
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value for key, evicting expired and then the oldest entries when full."""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            for stale in [k for k, (stored_at, _) in self._entries.items() if now - stored_at >= self.ttl]:
+                del self._entries[stale]
+            # Dicts keep insertion order, so the first keys are the oldest
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic(), value)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = bool
+    ) -> Any:
+        """
+        Return the cached value for key, loading it on a miss.
+
+        Concurrent misses for the same key share a single load, which is
+        forgotten as soon as it finishes.
+
+        Args:
+            key: Cache key
+            load: Coroutine function producing the value
+            should_cache: Decides whether a loaded value is stored; by default
+                empty results are not, so the next call retries
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, load, should_cache))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the load for the others
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]], should_cache: Callable[[Any], bool]) -> Any:
+        value = await load()
+        if should_cache(value):
+            self.set(key, value)
+        return value
@@ -1,15 +1,51 @@
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
+import heapq
 import logging
 import aiohttp
 import re
-import json
+import orjson
+from operator import itemgetter
 from urllib.parse import quote
-import traceback
+from .http_client import get_session, close_session
+from .ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Video searches are reused for this many seconds
+VIDEO_CACHE_TTL = 600
+
+# Maximum number of searches kept; YouTube answers any ticker string
+VIDEO_CACHE_MAX_ENTRIES = 256
+
+_VIDEO_CACHE = TTLCache(VIDEO_CACHE_TTL, VIDEO_CACHE_MAX_ENTRIES)
+
+_LEADING_NUMBER_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)')
+
+# Seconds per unit for relative times like "3 days ago", checked in order
+RELATIVE_TIME_UNITS = (
+    ('second', 1),
+    ('minute', 60),
+    ('hour', 3600),
+    ('day', 86400),
+    ('week', 604800),
+    ('month', 2592000),  # 30 days
+    ('year', 31536000),  # 365 days
+)
+
+# Location of the result sections in a youtubei/v1/search response
+SEARCH_RESULTS_PATH = ('contents', 'twoColumnSearchResultsRenderer', 'primaryContents', 'sectionListRenderer', 'contents')
+
+def _get_path(data: Any, path: tuple) -> Any:
+    """Follow path through nested dicts, returning None if any key is missing."""
+    try:
+        for key in path:
+            data = data[key]
+    except (KeyError, TypeError):
+        return None
+    return data
+
 def parse_duration(duration_text: str) -> int:
     """Convert duration text to seconds."""
     if not duration_text:
@@ -25,98 +61,107 @@ def parse_duration(duration_text: str) -> int:
         return hours * 3600 + minutes * 60 + seconds
     return 0
 
+def _parse_leading_number(text: str) -> Optional[float]:
+    """Return the first number in text, ignoring thousands separators."""
+    match = _LEADING_NUMBER_RE.search(text)
+    return float(match.group(1).replace(',', '')) if match else None
+
 def parse_view_count(view_text: str) -> int:
     """Convert view count text to number."""
     if not view_text:
         return 0
     
-    # Remove "views", "K", "M", etc and convert to number
-    number = ''.join(filter(str.isdigit, view_text.split()[0]))
+    # Handle "1,234 views", "1.2K views", "3M views", etc
+    number = _parse_leading_number(view_text)
+    if number is None:
+        return 0
+    
     multiplier = 1
     if 'K' in view_text:
         multiplier = 1000
     elif 'M' in view_text:
         multiplier = 1000000
     
-    try:
-        return int(number) * multiplier if number else 0
-    except ValueError:
-        return 0
+    return int(number * multiplier)
 
-def parse_relative_time(time_text: str) -> datetime:
-    """Convert relative time text to datetime."""
-    now = datetime.now()
+def parse_relative_time(time_text: str, now: Optional[datetime] = None) -> datetime:
+    """Convert relative time text to datetime, relative to now (defaults to the current time)."""
+    if now is None:
+        now = datetime.now()
     
     if not time_text:
         return now
     
     time_text = time_text.lower()
-    number = int(''.join(filter(str.isdigit, time_text.split()[0])))
+    number = _parse_leading_number(time_text)
+    if number is None:
+        return now
     
-    if 'second' in time_text:
-        return now - timedelta(seconds=number)
-    elif 'minute' in time_text:
-        return now - timedelta(minutes=number)
-    elif 'hour' in time_text:
-        return now - timedelta(hours=number)
-    elif 'day' in time_text:
-        return now - timedelta(days=number)
-    elif 'week' in time_text:
-        return now - timedelta(weeks=number)
-    elif 'month' in time_text:
-        return now - timedelta(days=number * 30)
-    elif 'year' in time_text:
-        return now - timedelta(days=number * 365)
+    for unit, seconds in RELATIVE_TIME_UNITS:
+        if unit in time_text:
+            return now - timedelta(seconds=number * seconds)
     
     return now
 
-def calculate_video_score(video: Dict[str, Any], search_mode: str = 'balanced') -> float:
+# Channel quality indicators
+CHANNEL_INDICATORS = {
+    'finance': 2.0,
+    'invest': 2.0,
+    'stock': 2.0,
+    'trading': 1.5,
+    'money': 1.2,
+    'business': 1.2,
+    'news': 1.2,
+}
+
+# Title quality indicators
+TITLE_INDICATORS = {
+    'analysis': 2.0,
+    'prediction': 1.5,
+    'forecast': 1.5,
+    'technical': 1.3,
+    'fundamental': 1.3,
+    'earnings': 1.3,
+    'research': 1.2,
+    'review': 1.2,
+}
+
+# Weights of (title, channel, view, recency) scores for each search mode
+SCORE_WEIGHTS = {
+    'recent': (0.2, 0.1, 0.1, 0.6),
+    'popular': (0.2, 0.1, 0.6, 0.1),
+    'relevant': (0.4, 0.3, 0.2, 0.1),
+    'balanced': (0.3, 0.2, 0.25, 0.25),
+}
+
+def calculate_video_score(video: Dict[str, Any], search_mode: str = 'balanced', now: Optional[datetime] = None) -> float:
     """
     Calculate a quality score for a video based on various metrics.
     
     Args:
         video: Video data dictionary
         search_mode: One of 'recent', 'relevant', 'popular', or 'balanced'
+        now: Reference time for the video's age, defaults to the current time
         
     Returns:
         Float score where higher is better
     """
+    if now is None:
+        now = datetime.now()
+    
     # Base factors
     views = parse_view_count(video.get('views', '0'))
     duration = parse_duration(video.get('duration', '0:00'))
-    age_hours = (datetime.now() - video.get('published_at', datetime.now())).total_seconds() / 3600
-    
-    # Channel quality indicators
-    channel_indicators = {
-        'finance': 2.0,
-        'invest': 2.0,
-        'stock': 2.0,
-        'trading': 1.5,
-        'money': 1.2,
-        'business': 1.2,
-        'news': 1.2,
-    }
-    
-    # Title quality indicators
-    title_indicators = {
-        'analysis': 2.0,
-        'prediction': 1.5,
-        'forecast': 1.5,
-        'technical': 1.3,
-        'fundamental': 1.3,
-        'earnings': 1.3,
-        'research': 1.2,
-        'review': 1.2,
-    }
+    age_hours = (now - video.get('published_at', now)).total_seconds() / 3600
     
     # Calculate channel score
     channel_name = video.get('channel', '').lower()
-    channel_score = sum(boost for word, boost in channel_indicators.items() if word in channel_name)
+    channel_score = sum(boost for word, boost in CHANNEL_INDICATORS.items() if word in channel_name)
     channel_score = max(1.0, channel_score)  # Minimum score of 1.0
     
     # Calculate title score
     title = video.get('title', '').lower()
-    title_score = sum(boost for word, boost in title_indicators.items() if word in title)
+    title_score = sum(boost for word, boost in TITLE_INDICATORS.items() if word in title)
     title_score = max(1.0, title_score)  # Minimum score of 1.0
     
     # Penalize extremely short or long videos
@@ -133,40 +178,40 @@ def calculate_video_score(video: Dict[str, Any], search_mode: str = 'balanced')
     recency_score = max(0.1, 1.0 * pow(0.99, age_hours))
     
     # Calculate final score based on search mode
-    if search_mode == 'recent':
-        final_score = (
-            recency_score * 0.6 +
-            title_score * 0.2 +
-            channel_score * 0.1 +
-            view_score * 0.1
-        ) * duration_penalty
-    elif search_mode == 'popular':
-        final_score = (
-            view_score * 0.6 +
-            title_score * 0.2 +
-            channel_score * 0.1 +
-            recency_score * 0.1
-        ) * duration_penalty
-    elif search_mode == 'relevant':
-        final_score = (
-            title_score * 0.4 +
-            channel_score * 0.3 +
-            view_score * 0.2 +
-            recency_score * 0.1
-        ) * duration_penalty
-    else:  # balanced
-        final_score = (
-            title_score * 0.3 +
-            channel_score * 0.2 +
-            view_score * 0.25 +
-            recency_score * 0.25
-        ) * duration_penalty
+    title_weight, channel_weight, view_weight, recency_weight = SCORE_WEIGHTS.get(
+        search_mode, SCORE_WEIGHTS['balanced']
+    )
+    final_score = (
+        title_score * title_weight +
+        channel_score * channel_weight +
+        view_score * view_weight +
+        recency_score * recency_weight
+    ) * duration_penalty
     
     return final_score
 
 async def fetch_stock_videos(ticker: str, max_results: int = 5, search_mode: str = 'balanced') -> List[Dict[str, Any]]:
     """
-    Fetch stock-related videos from YouTube using their AJAX API.
+    Fetch stock-related videos from YouTube. Results are cached per search for
+    VIDEO_CACHE_TTL seconds, and concurrent misses share a single request.
+    
+    Args:
+        ticker: Stock ticker symbol
+        max_results: Maximum number of videos to return
+        search_mode: One of 'recent', 'relevant', 'popular', or 'balanced'
+        
+    Returns:
+        List of video information dictionaries
+    """
+    # Empty results usually mean a failed request, so they are not cached
+    return await _VIDEO_CACHE.get_or_load(
+        (ticker, max_results, search_mode),
+        lambda: _search_videos(ticker, max_results, search_mode)
+    )
+
+async def _search_videos(ticker: str, max_results: int, search_mode: str) -> List[Dict[str, Any]]:
+    """
+    Search stock-related videos using YouTube's AJAX API.
     
     Args:
         ticker: Stock ticker symbol
@@ -216,107 +261,107 @@ async def fetch_stock_videos(ticker: str, max_results: int = 5, search_mode: str
     }
     
     try:
-        async with aiohttp.ClientSession() as session:
-            logger.debug(f"Making request to {url}")
-            async with session.post(url, params=params, headers=headers, json=payload) as response:
-                if response.status != 200:
-                    logger.error(f"YouTube request failed with status {response.status}")
-                    return []
+        session = await get_session()
+        logger.debug(f"Making request to {url}")
+        async with session.post(url, params=params, headers=headers, json=payload) as response:
+            if response.status != 200:
+                logger.error(f"YouTube request failed with status {response.status}")
+                return []
+            
+            try:
+                data = orjson.loads(await response.read())
+                logger.debug("Successfully parsed YouTube data")
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Failed to parse YouTube data: {str(e)}")
+                return []
+            
+            videos = []
+            try:
+                # Extract videos from the response
+                contents = _get_path(data, SEARCH_RESULTS_PATH) or []
                 
-                try:
-                    data = await response.json()
-                    logger.debug("Successfully parsed YouTube data")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse YouTube data: {str(e)}")
-                    return []
+                # Find video items
+                items = []
+                for section in contents:
+                    if 'itemSectionRenderer' in section:
+                        items = section['itemSectionRenderer'].get('contents', [])
+                        break
                 
-                videos = []
-                try:
-                    # Extract videos from the response
-                    contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {}).get('sectionListRenderer', {}).get('contents', [])
-                    
-                    # Find video items
-                    items = []
-                    for section in contents:
-                        if 'itemSectionRenderer' in section:
-                            items = section['itemSectionRenderer'].get('contents', [])
-                            break
-                    
-                    logger.debug(f"Found {len(items)} potential video items")
+                logger.debug(f"Found {len(items)} potential video items")
+                
+                # Collect all valid videos first, scored against one reference time
+                all_videos = []
+                now = datetime.now()
+                for item in items:
+                    video_renderer = item.get('videoRenderer')
+                    if not video_renderer:
+                        continue
                     
-                    # Collect all valid videos first
-                    all_videos = []
-                    for item in items:
-                        video_renderer = item.get('videoRenderer')
-                        if not video_renderer:
+                    try:
+                        # Extract video information with better error handling
+                        video_id = video_renderer.get('videoId', '')
+                        
+                        # Title is nested in runs array
+                        title_runs = video_renderer.get('title', {}).get('runs', [])
+                        title = title_runs[0].get('text', '') if title_runs else ''
+                        
+                        # Description might be in different formats
+                        description = ''
+                        desc_snippet = video_renderer.get('descriptionSnippet', {})
+                        if isinstance(desc_snippet, dict):
+                            desc_runs = desc_snippet.get('runs', [])
+                            description = ''.join(run.get('text', '') for run in desc_runs)
+                        
+                        # Channel name is nested
+                        channel_runs = video_renderer.get('ownerText', {}).get('runs', [])
+                        channel = channel_runs[0].get('text', '') if channel_runs else ''
+                        
+                        # Published date
+                        published = video_renderer.get('publishedTimeText', {}).get('simpleText', '')
+                        
+                        # View count
+                        views = video_renderer.get('viewCountText', {}).get('simpleText', '')
+                        
+                        # Duration
+                        duration = video_renderer.get('lengthText', {}).get('simpleText', '')
+                        
+                        if not (video_id and title):  # Skip if missing essential info
                             continue
                         
-                        try:
-                            # Extract video information with better error handling
-                            video_id = video_renderer.get('videoId', '')
-                            
-                            # Title is nested in runs array
-                            title_runs = video_renderer.get('title', {}).get('runs', [])
-                            title = title_runs[0].get('text', '') if title_runs else ''
-                            
-                            # Description might be in different formats
-                            description = ''
-                            desc_snippet = video_renderer.get('descriptionSnippet', {})
-                            if isinstance(desc_snippet, dict):
-                                desc_runs = desc_snippet.get('runs', [])
-                                description = ''.join(run.get('text', '') for run in desc_runs)
-                            
-                            # Channel name is nested
-                            channel_runs = video_renderer.get('ownerText', {}).get('runs', [])
-                            channel = channel_runs[0].get('text', '') if channel_runs else ''
-                            
-                            # Published date
-                            published = video_renderer.get('publishedTimeText', {}).get('simpleText', '')
-                            
-                            # View count
-                            views = video_renderer.get('viewCountText', {}).get('simpleText', '')
-                            
-                            # Duration
-                            duration = video_renderer.get('lengthText', {}).get('simpleText', '')
-                            
-                            if not (video_id and title):  # Skip if missing essential info
-                                continue
-                            
-                            video_data = {
-                                "title": title,
-                                "url": f"https://youtube.com/watch?v={video_id}",
-                                "summary": description[:200] + "..." if description else "",
-                                "channel": channel,
-                                "views": views,
-                                "duration": duration,
-                                "published_at": parse_relative_time(published)
-                            }
-                            
-                            # Calculate video score
-                            video_data['score'] = calculate_video_score(video_data, search_mode)
-                            all_videos.append(video_data)
+                        video_data = {
+                            "title": title,
+                            "url": f"https://youtube.com/watch?v={video_id}",
+                            "summary": description[:200] + "..." if description else "",
+                            "channel": channel,
+                            "views": views,
+                            "duration": duration,
+                            "published_at": parse_relative_time(published, now)
+                        }
+                        
+                        # Calculate video score
+                        video_data['score'] = calculate_video_score(video_data, search_mode, now)
+                        all_videos.append(video_data)
+                        if logger.isEnabledFor(logging.DEBUG):
                             logger.debug(f"Added video: {title} (score: {video_data['score']:.2f})")
-                            
-                        except Exception as e:
-                            logger.warning(f"Error extracting video data: {str(e)}")
-                            continue
-                    
-                    # Sort videos by score and take top N
-                    videos = sorted(all_videos, key=lambda x: x['score'], reverse=True)[:max_results]
-                    logger.info(f"Found {len(videos)} videos after scoring")
-                    return videos
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing YouTube video data: {str(e)}")
-                    logger.error(f"Stack trace: {traceback.format_exc()}")
-                    return []
-                    
+                        
+                    except Exception as e:
+                        logger.warning(f"Error extracting video data: {str(e)}")
+                        continue
+                
+                # Take the top N by score without sorting the whole batch
+                videos = heapq.nlargest(max_results, all_videos, key=itemgetter('score'))
+                logger.info(f"Found {len(videos)} videos after scoring")
+                return videos
+                
+            except Exception as e:
+                logger.exception(f"Error parsing YouTube video data: {str(e)}")
+                return []
+                
     except aiohttp.ClientError as e:
         logger.error(f"Network error fetching YouTube videos: {str(e)}")
         return []
     except Exception as e:
-        logger.error(f"Unexpected error fetching YouTube videos: {str(e)}")
-        logger.error(f"Stack trace: {traceback.format_exc()}")
+        logger.exception(f"Unexpected error fetching YouTube videos: {str(e)}")
         return []
 
 if __name__ == "__main__":
@@ -332,5 +377,6 @@ if __name__ == "__main__":
             print(f"Published: {video['published_at']}")
             print(f"Score: {video['score']:.2f}")
             print("-" * 80)
+        await close_session()
     
     asyncio.run(test())
\ No newline at end of file
@@ -1,18 +1,29 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .services import StockService
 from .models import StockReport
+from .agents.http_client import close_session
 import os
+import asyncio
+import logging
+from typing import Dict
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
 # Verify required environment variables
 if not os.getenv("GOOGLE_API_KEY"):
     raise ValueError("GOOGLE_API_KEY environment variable is required")
 
-app = FastAPI(title="Stock Analysis API")
+app = FastAPI(title="Stock Analysis API", default_response_class=ORJSONResponse)
+
+# Reports currently being generated, so concurrent requests for a ticker share one run
+_inflight_reports: Dict[str, asyncio.Task] = {}
 
 # Add CORS middleware
 app.add_middleware(
@@ -23,6 +34,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup():
+    """Create the service shared by all requests"""
+    app.state.stock_service = StockService()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release the shared browser and HTTP connections"""
+    await app.state.stock_service.close()
+    await close_session()
+
 @app.post("/report/{ticker}", response_model=StockReport)
 async def generate_stock_report(ticker: str):
     """
@@ -32,10 +54,17 @@ async def generate_stock_report(ticker: str):
     - YouTube video insights
     - AI-generated summary and insights
     """
+    # Normalize so "aapl" and " AAPL " share the same cache entries
+    ticker = ticker.strip().upper()
     try:
-        async with StockService() as service:
-            report = await service.generate_report(ticker)
-            return report
+        task = _inflight_reports.get(ticker)
+        if task is None:
+            task = asyncio.create_task(app.state.stock_service.generate_report(ticker))
+            _inflight_reports[ticker] = task
+            task.add_done_callback(lambda _: _inflight_reports.pop(ticker, None))
+        # Shield so one client disconnecting does not cancel the run for the others
+        report = await asyncio.shield(task)
+        return report
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
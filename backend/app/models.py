@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -11,26 +11,16 @@ class StockData(BaseModel):
 class NewsArticle(BaseModel):
     headline: str
     summary: str
-    url: HttpUrl
+    url: str
     sentiment: str
     published_at: datetime = Field(default_factory=datetime.now)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class YouTubeVideo(BaseModel):
     title: str
-    url: HttpUrl
+    url: str
     summary: str
     channel: str
     published_at: datetime = Field(default_factory=datetime.now)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class StockReport(BaseModel):
     ticker: str
@@ -40,8 +30,3 @@ class StockReport(BaseModel):
     news_articles: List[NewsArticle]
     youtube_videos: List[YouTubeVideo]
     full_report: str
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
@@ -1,32 +1,78 @@
-from datetime import datetime
 from typing import List, Dict, Any
-import yfinance as yf
-from playwright.async_api import async_playwright
-from agentql import wrap
-from google.cloud import language_v2
-import google_auth_oauthlib.flow
-import googleapiclient.discovery
-import googleapiclient.errors
 import asyncio
+import re
 from .agents.youtube_agent import fetch_stock_videos
 from .agents.news_lookup_agent import fetch_news_links
 from .agents.browser_context import BrowserContext
-from .agents.report_generator import StockReportGenerator
+from .agents.report_generator import StockReportGenerator, fetch_stock_data
+from .agents.ttl_cache import TTLCache
+
+# A "News Sentiment" or "Actionable Summary" heading (markdown or bold, optionally
+# numbered), the rest of its line, and its body up to the next heading or the end.
+# A section ends at a markdown heading, at one of these two headings, or at a line
+# that is bold by itself ("**6. Potential Risks**"); bold labels followed by text,
+# such as "**Overall Sentiment:** Positive", stay inside the section.
+_SECTION_RE = re.compile(
+    r'^[#*\d. \t]*(?P<name>News Sentiment|Actionable Summary)(?P<rest>[^\n]*)\n?'
+    r'(?P<body>.*?)'
+    r'(?=^(?:#'
+    r'|[#*\d. \t]*(?:News Sentiment|Actionable Summary)'
+    r'|(?:\d+\.[ \t]*)?\*\*[^\n]*\*\*:?[ \t]*$)'
+    r'|\Z)',
+    re.MULTILINE | re.DOTALL
+)
+
+# Markdown bullet markers accepted for key insights
+_BULLET_MARKERS = ('*', '-')
+
+def _strip_markup(line: str) -> str:
+    """Remove bullet markers and bold markers from a report line."""
+    return line.replace('**', '').lstrip('-').strip('* \t')
+
+def _extract_sections(report: str) -> Dict[str, List[str]]:
+    """
+    Find the sections we summarize in the markdown report.
+    
+    Returns:
+        Section name -> its non-empty lines. Text on the heading line itself,
+        as in "**News Sentiment**: Positive overall.", becomes the first line.
+    """
+    sections = {}
+    for match in _SECTION_RE.finditer(report):
+        rest = match.group('rest')
+        # Keep what follows a ":" or the closing "**", not the rest of the heading title
+        if ':' in rest:
+            heading_text = rest.partition(':')[2]
+        else:
+            heading_text = rest.partition('**')[2]
+        lines = [line.strip() for line in match.group('body').splitlines() if line.strip()]
+        heading_text = _strip_markup(heading_text)
+        if heading_text:
+            lines.insert(0, heading_text)
+        sections[match.group('name')] = lines
+    return sections
+
+# Seconds to serve a finished report before regenerating it
+REPORT_CACHE_TTL = 600
+
+# Maximum number of finished reports kept in memory
+REPORT_CACHE_MAX_ENTRIES = 128
+
+_REPORT_CACHE = TTLCache(REPORT_CACHE_TTL, REPORT_CACHE_MAX_ENTRIES)
 
 class StockService:
     def __init__(self):
-        pass
+        # The generator is stateless between calls, so one instance serves every report
+        self._report_generator = StockReportGenerator()
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
+    async def close(self):
+        """Shut down the shared browser. Called once when the app stops."""
         await BrowserContext.close()
 
     async def get_stock_data(self, ticker: str) -> Dict[str, Any]:
         """Get basic stock data from Yahoo Finance."""
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        # Shares the cached lookup used by the report generator
+        info, _ = await fetch_stock_data(ticker)
         
         return {
             "price": info.get("currentPrice", 0.0),
@@ -52,43 +98,46 @@ class StockService:
             return []
 
     async def generate_report(self, ticker: str) -> Dict[str, Any]:
+        """Generate a comprehensive stock report, reusing one generated in the last REPORT_CACHE_TTL seconds."""
+        report = _REPORT_CACHE.get(ticker)
+        if report is not None:
+            return report
+        
+        report = await self._build_report(ticker)
+        _REPORT_CACHE.set(ticker, report)
+        return report
+
+    async def _build_report(self, ticker: str) -> Dict[str, Any]:
         """Generate a comprehensive stock report."""
         try:
-            # Get data from different sources concurrently
-            stock_data = await self.get_stock_data(ticker)
-            
-            # Generate the full report using our StockReportGenerator
-            report_generator = StockReportGenerator()
-            full_report = await report_generator.generate_report(ticker)
+            # Get data from different sources concurrently; the news and video
+            # agents handle their own errors, so only stock data or the report can fail
+            stock_data, full_report, news_articles, youtube_videos = await asyncio.gather(
+                self.get_stock_data(ticker),
+                self._report_generator.generate_report(ticker),
+                self.get_news_articles(ticker),
+                self.get_youtube_videos(ticker)
+            )
             
-            # Extract key insights from the report
-            # Split the report into sections based on markdown headers
-            sections = full_report.split('**')
+            # Pull the sections we summarize out of the markdown in one pass
+            sections = _extract_sections(full_report)
             
-            # Extract sentiment summary (usually in the News Sentiment section)
+            # Sentiment summary is the first line of the News Sentiment section
             sentiment_summary = "Neutral"  # Default
-            for section in sections:
-                if "News Sentiment" in section:
-                    sentiment_lines = section.split('\n')
-                    if len(sentiment_lines) > 1:
-                        sentiment_summary = sentiment_lines[1].strip('* ')
+            sentiment_lines = sections.get("News Sentiment")
+            if sentiment_lines:
+                sentiment_summary = _strip_markup(sentiment_lines[0])
             
-            # Extract key insights from the Actionable Summary section
-            key_insights = []
-            for section in sections:
-                if "Actionable Summary" in section:
-                    insights = section.split('\n')
-                    key_insights = [line.strip('* ') for line in insights if line.strip().startswith('*')]
+            # Key insights are the bullet points of the Actionable Summary section
+            key_insights = [
+                _strip_markup(line)
+                for line in sections.get("Actionable Summary", [])
+                if line.startswith(_BULLET_MARKERS)
+            ]
             
             if not key_insights:  # Fallback if no insights found
                 key_insights = ["Analysis in progress", "Check full report for details"]
             
-            # Get news and videos concurrently
-            news_articles, youtube_videos = await asyncio.gather(
-                self.get_news_articles(ticker),
-                self.get_youtube_videos(ticker)
-            )
-            
             return {
                 "ticker": ticker,
                 "sentiment_summary": sentiment_summary,